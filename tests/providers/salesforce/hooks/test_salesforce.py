@@ -0,0 +1,173 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import csv
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from airflow.providers.salesforce.hooks.salesforce import SalesforceHook
+
+
+class TestSalesforceHook(unittest.TestCase):
+    def setUp(self):
+        self.salesforce_hook = SalesforceHook(salesforce_conn_id="conn_id")
+
+    @mock.patch("airflow.providers.salesforce.hooks.salesforce.SalesforceHook.describe_object")
+    def test_object_to_df_coerce_to_timestamp_with_null_date(self, mock_describe_object):
+        mock_describe_object.return_value = {"fields": [{"name": "CreatedDate", "type": "datetime"}]}
+        query_results = [
+            {
+                "attributes": {"type": "Account"},
+                "Id": "1",
+                "CreatedDate": "2021-01-01T00:00:00.000+0000",
+            },
+            {"attributes": {"type": "Account"}, "Id": "2", "CreatedDate": None},
+        ]
+
+        df = self.salesforce_hook.object_to_df(query_results, coerce_to_timestamp=True)
+
+        self.assertEqual(1609459200.0, df["createddate"][0])
+        self.assertTrue(np.isnan(df["createddate"][1]))
+
+    @mock.patch("airflow.providers.salesforce.hooks.salesforce.SalesforceHook.describe_object")
+    def test_object_to_df_coerce_to_timestamp_with_all_null_date_column(self, mock_describe_object):
+        mock_describe_object.return_value = {"fields": [{"name": "LastActivityDate", "type": "date"}]}
+        query_results = [
+            {"attributes": {"type": "Account"}, "Id": "1", "LastActivityDate": None},
+            {"attributes": {"type": "Account"}, "Id": "2", "LastActivityDate": None},
+        ]
+
+        df = self.salesforce_hook.object_to_df(query_results, coerce_to_timestamp=True)
+
+        self.assertTrue(df["lastactivitydate"].isna().all())
+
+    def test_object_to_df_with_nested_relationship_fields(self):
+        query_results = [
+            {
+                "attributes": {"type": "Contact"},
+                "Id": "1",
+                "Account": {"attributes": {"type": "Account"}, "Name": "Acme"},
+            },
+            {
+                "attributes": {"type": "Contact"},
+                "Id": "2",
+                "Account": {"attributes": {"type": "Account"}, "Name": "Acme"},
+            },
+        ]
+
+        df = self.salesforce_hook.object_to_df(query_results)
+
+        self.assertEqual("Acme", df["account"][0]["Name"])
+        self.assertEqual(["1", "2"], list(df["id"]))
+
+    def test_object_to_df_with_empty_query_results(self):
+        df = self.salesforce_hook.object_to_df([])
+
+        self.assertTrue(df.empty)
+
+    def test_write_record_stream_ndjson_has_no_blank_lines(self):
+        query_results = [
+            {"attributes": {"type": "Account"}, "Id": str(n), "Name": f"name{n}"} for n in range(3)
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "test.ndjson")
+            self.salesforce_hook._write_record_stream(
+                records=iter(query_results),
+                filename=filename,
+                fmt="ndjson",
+                coerce_to_timestamp=False,
+                record_time_added=False,
+                chunk_size=1,
+            )
+            with open(filename) as file_handle:
+                lines = file_handle.read().splitlines()
+
+        self.assertEqual(3, len(lines))
+        self.assertNotIn("", lines)
+        self.assertEqual("0", json.loads(lines[0])["id"])
+
+    def test_write_record_stream_json_produces_one_document(self):
+        query_results = [
+            {"attributes": {"type": "Account"}, "Id": str(n), "Name": f"name{n}"} for n in range(3)
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "test.json")
+            self.salesforce_hook._write_record_stream(
+                records=iter(query_results),
+                filename=filename,
+                fmt="json",
+                coerce_to_timestamp=False,
+                record_time_added=False,
+                chunk_size=2,
+            )
+            with open(filename) as file_handle:
+                data = json.load(file_handle)
+
+        self.assertEqual(["0", "1", "2"], [record["id"] for record in data])
+
+    def test_write_record_stream_csv_matches_list_output(self):
+        query_results = [
+            {"attributes": {"type": "Account"}, "Id": str(n), "Name": f"name\n{n}"} for n in range(3)
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            list_filename = os.path.join(tmp, "list.csv")
+            stream_filename = os.path.join(tmp, "stream.csv")
+            self.salesforce_hook.write_object_to_file(query_results, filename=list_filename)
+            self.salesforce_hook._write_record_stream(
+                records=iter(query_results),
+                filename=stream_filename,
+                fmt="csv",
+                coerce_to_timestamp=False,
+                record_time_added=False,
+                chunk_size=2,
+            )
+            with open(list_filename) as file_handle:
+                list_output = file_handle.read()
+            with open(stream_filename) as file_handle:
+                stream_output = file_handle.read()
+
+        self.assertEqual(list_output, stream_output)
+
+    def test_write_record_stream_csv_renders_nulls_consistently_across_chunks(self):
+        # a low-cardinality column with a null in only one chunk must not
+        # flip between the stringified null and an empty cell depending on
+        # whether that chunk's slice of it was categorized
+        types = ["A", "A", None, "A", "A", None]
+        query_results = [
+            {"attributes": {"type": "Account"}, "Id": str(n), "Type": value}
+            for n, value in enumerate(types)
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "test.csv")
+            self.salesforce_hook._write_record_stream(
+                records=iter(query_results),
+                filename=filename,
+                fmt="csv",
+                coerce_to_timestamp=False,
+                record_time_added=False,
+                chunk_size=3,
+            )
+            with open(filename) as file_handle:
+                rows = list(csv.DictReader(file_handle))
+
+        self.assertEqual(["A", "A", "None", "A", "A", "None"], [row["type"] for row in rows])